@@ -0,0 +1,131 @@
+"""
+Allocation of order lines across warehouse locations.
+"""
+
+import heapq
+from typing import Any, Callable, Dict, List, Union
+from errors import InsufficientStockError, InvalidQuantityError
+from item import Item
+
+# A strategy maps (units at location, distance of location) to a priority.
+# Lower priorities are drawn from first.
+Strategy = Callable[[int, float], Any]
+
+STRATEGIES: Dict[str, Strategy] = {
+    # Closest warehouse first, bigger stock breaks ties
+    'nearest': lambda units, distance: (distance, -units),
+    # Biggest stock first; this also splits a line across the fewest locations
+    'largest_first': lambda units, distance: (-units, distance),
+}
+STRATEGIES['fewest_splits'] = STRATEGIES['largest_first']
+
+
+class StockAllocator:
+    """Picks the locations that fulfil each order line."""
+
+    def __init__(self, items: List[Item], distances: Dict[str, float] = None,
+                 strategy: Union[str, Strategy] = 'nearest'):
+        """
+        Build a location heap for every item and start tracking its stock.
+        Each item can be tracked by one allocator at a time.
+        Args:
+            items: Store catalog
+            distances: Distance of each location (unknown locations count as 0)
+            strategy: Name from STRATEGIES or a custom priority function
+        """
+        if isinstance(strategy, str):
+            if strategy not in STRATEGIES:
+                raise ValueError(f"Unknown allocation strategy: '{strategy}'")
+            strategy = STRATEGIES[strategy]
+        self._strategy = strategy
+        self._distances = distances or {}
+        # per item: heap of (priority, version, location) entries
+        self._heaps = {}
+        # per item: current version of each location, older heap entries are stale
+        self._versions = {}
+        for item in items:
+            self._build_heap(item)
+            # every stock change, from here or elsewhere, updates the heap
+            item.location_listener = self._touch
+
+    def _priority(self, location: str, units: int) -> Any:
+        return self._strategy(units, self._distances.get(location, 0))
+
+    def _build_heap(self, item: Item) -> None:
+        """(Re)build the location heap of an item from its current stock."""
+        versions = self._versions.setdefault(item.name, {})
+        heap = []
+        for location, units in item.locations.items():
+            version = versions.get(location, 0)
+            versions[location] = version
+            if units > 0:
+                heap.append((self._priority(location, units), version, location))
+        heapq.heapify(heap)
+        self._heaps[item.name] = heap
+
+    def _touch(self, item: Item, location: str) -> None:
+        """Record a stock change at a location, O(log W)."""
+        versions = self._versions[item.name]
+        versions[location] = versions.get(location, 0) + 1
+        units = item.locations[location]
+        heap = self._heaps[item.name]
+        if units > 0:
+            heapq.heappush(heap, (self._priority(location, units), versions[location], location))
+        # drop stale entries once they outnumber the locations
+        if len(heap) > 2 * len(item.locations):
+            self._build_heap(item)
+
+    def allocate(self, item: Item, quantity: int) -> Dict[str, int]:
+        """
+        Take quantity units of item from its locations.
+        Returns:
+            Units taken per location, in the order they were picked
+        """
+        if quantity <= 0:
+            raise InvalidQuantityError(f"Quantity must be positive, got: {quantity}")
+        if not item.has_stock(quantity):
+            raise InsufficientStockError(
+                f"Not enough stock for '{item.name}'. "
+                f"Available: {item.stock}, requested: {quantity}"
+            )
+
+        versions = self._versions[item.name]
+        allocation = {}
+        remaining = quantity
+        while remaining:
+            # _touch may rebuild the heap, so look it up every time
+            heap = self._heaps[item.name]
+            if not heap:
+                break
+            _, version, location = heapq.heappop(heap)
+            if version != versions[location]:
+                continue
+            taken = min(remaining, item.locations[location])
+            # calls back into _touch, which pushes the location's new entry
+            item.reduce_location_stock(location, taken)
+            allocation[location] = taken
+            remaining -= taken
+
+        if remaining:
+            # locations did not add up to the item's stock, undo what was taken
+            self.release(item, allocation, quantity - remaining)
+            raise InsufficientStockError(
+                f"Not enough stock across locations for '{item.name}', requested: {quantity}"
+            )
+        return allocation
+
+    def release(self, item: Item, allocation: Dict[str, int], quantity: int) -> None:
+        """
+        Return quantity units of an allocation to their locations.
+        Units picked last are returned first. The allocation is updated in place.
+        """
+        for location in reversed(list(allocation)):
+            if quantity <= 0:
+                break
+            returned = min(quantity, allocation[location])
+            item.add_location_stock(location, returned)
+            quantity -= returned
+            if returned == allocation[location]:
+                del allocation[location]
+            else:
+                allocation[location] -= returned
@@ -0,0 +1,58 @@
+"""
+Benchmark for allocating order lines across many warehouses.
+
+Usage: python bench_allocation.py [warehouses] [cart_lines]
+"""
+
+import random
+import sys
+import time
+from allocation import STRATEGIES, StockAllocator
+from item import Item
+
+ROUNDS = 20
+
+
+def build_items(warehouses: int, cart_lines: int) -> list:
+    """Create items with random stock spread across every warehouse."""
+    rng = random.Random(0)
+    return [Item(f'Item {i:06d}', 1.0, 'benchmark item', 0,
+                 {f'W{w:04d}': rng.randint(0, 50) for w in range(warehouses)})
+            for i in range(cart_lines)]
+
+
+def main():
+    """Allocate and release a large cart with each strategy and print lines per second."""
+    warehouses = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    cart_lines = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    rng = random.Random(1)
+    distances = {f'W{w:04d}': rng.uniform(0, 1000) for w in range(warehouses)}
+    quantities = [rng.randint(1, 80) for _ in range(cart_lines)]
+
+    for name in sorted(STRATEGIES):
+        items = build_items(warehouses, cart_lines)
+        start = time.perf_counter()
+        allocator = StockAllocator(items, distances, name)
+        build_time = time.perf_counter() - start
+
+        allocate_time = 0.0
+        splits = 0
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            allocations = [allocator.allocate(item, quantity)
+                           for item, quantity in zip(items, quantities)]
+            allocate_time += time.perf_counter() - start
+            splits += sum(len(allocation) for allocation in allocations)
+            # Return the stock for the next round
+            for item, quantity, allocation in zip(items, quantities, allocations):
+                allocator.release(item, allocation, quantity)
+
+        total_lines = ROUNDS * cart_lines
+        print(f"{name:<14} heaps built in {build_time:.2f}s | "
+              f"{total_lines / allocate_time:,.0f} lines/s | "
+              f"{splits / total_lines:.2f} locations per line")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Throughput benchmark for cart snapshot encoding and decoding.
+
+Usage: python bench_cart_snapshot.py [catalog_size] [cart_lines]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import yaml
+from store import Store
+
+ROUNDS = 200
+
+
+def build_store(catalog_size: int) -> Store:
+    """Create a store backed by a generated catalog file."""
+    items = [{'name': f'Item {i:06d}', 'price': 1 + i % 100,
+              'description': 'benchmark item', 'stock': 1000}
+             for i in range(catalog_size)]
+    with tempfile.NamedTemporaryFile('w', suffix='.yml', delete=False) as f:
+        yaml.safe_dump({'items': items}, f)
+        path = f.name
+    try:
+        return Store(path)
+    finally:
+        os.remove(path)
+
+
+def main():
+    """Run the benchmark and print lines per second."""
+    catalog_size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    cart_lines = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    source = build_store(catalog_size)
+    target = build_store(catalog_size)
+    for item in source.get_items()[:cart_lines]:
+        source.add_item(item.name, 2)
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        snapshot = source.export_cart()
+    encode_time = time.perf_counter() - start
+
+    decode_time = 0.0
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = target.import_cart(snapshot)
+        decode_time += time.perf_counter() - start
+        # Put the target back to an empty cart for the next round
+        target.clear_cart()
+
+    if not result['success']:
+        print(result['message'])
+        return
+
+    total_lines = ROUNDS * cart_lines
+    print(f"Snapshot size: {len(snapshot)} bytes for {cart_lines} lines")
+    print(f"Encode: {total_lines / encode_time:,.0f} lines/s")
+    print(f"Decode + import: {total_lines / decode_time:,.0f} lines/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark for the per-mutation cost of the change feed.
+
+Times the path a store operation takes: allocating stock across warehouses
+and updating the cart, then the reverse.
+
+Usage: python bench_change_feed.py [operations]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import yaml
+from allocation import StockAllocator
+from events import ChangeFeed
+from item import Item
+from shopping_cart import ShoppingCart
+from store import Store
+
+WAREHOUSES = {'North': 5, 'South': 20, 'East': 10, 'West': 15}
+
+
+def time_components(feed: ChangeFeed, operations: int) -> float:
+    """Return nanoseconds per add or remove, using the allocator and cart directly."""
+    item = Item('Lamp', 1.0, 'benchmark item', 0,
+                {location: 3 for location in WAREHOUSES}, feed)
+    allocator = StockAllocator([item], WAREHOUSES)
+    cart = ShoppingCart(feed)
+
+    start = time.perf_counter()
+    for _ in range(operations // 2):
+        allocation = allocator.allocate(item, 5)
+        cart.add_item(item, 5)
+        if feed is not None:
+            feed.flush()
+        cart.remove_item(item.name, 5)
+        allocator.release(item, allocation, 5)
+        if feed is not None:
+            feed.flush()
+    return (time.perf_counter() - start) * 1e9 / operations
+
+
+def build_store() -> Store:
+    """Create a store with one item spread across every warehouse."""
+    inventory = {
+        'warehouses': [{'name': name, 'distance': distance} for name, distance in WAREHOUSES.items()],
+        'items': [{'name': 'Lamp', 'price': 1, 'description': 'benchmark item',
+                   'locations': {location: 3 for location in WAREHOUSES}}]
+    }
+    with tempfile.NamedTemporaryFile('w', suffix='.yml', delete=False) as f:
+        yaml.safe_dump(inventory, f)
+        path = f.name
+    try:
+        return Store(path)
+    finally:
+        os.remove(path)
+
+
+def time_store(store: Store, operations: int) -> float:
+    """Return nanoseconds per Store.add_item or Store.remove_item call."""
+    start = time.perf_counter()
+    for _ in range(operations // 2):
+        store.add_item('Lamp', 5)
+        store.remove_item('Lamp')
+    return (time.perf_counter() - start) * 1e9 / operations
+
+
+def main():
+    """Compare store operations without a feed, with an idle feed and with a subscriber."""
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    received = []
+
+    def subscriber(batch):
+        received.append(len(batch))
+
+    baseline = time_components(None, operations)
+    idle = time_components(ChangeFeed(), operations)
+    feed = ChangeFeed()
+    feed.subscribe(subscriber)
+    subscribed = time_components(feed, operations)
+
+    print("Allocator + cart, per operation:")
+    print(f"  No feed:          {baseline:7.1f} ns")
+    print(f"  Idle feed:        {idle:7.1f} ns (+{idle - baseline:.1f})")
+    print(f"  One subscriber:   {subscribed:7.1f} ns (+{subscribed - baseline:.1f})")
+
+    store = build_store()
+    store_idle = time_store(store, operations)
+    store.changes.subscribe(subscriber)
+    store_subscribed = time_store(store, operations)
+
+    print("Store.add_item / remove_item, per operation:")
+    print(f"  Idle feed:        {store_idle:7.1f} ns")
+    print(f"  One subscriber:   {store_subscribed:7.1f} ns (+{store_subscribed - store_idle:.1f})")
+    print(f"{sum(received)} events delivered in {len(received)} batches, "
+          f"{feed.dropped + store.changes.dropped} dropped")
+
+
+if __name__ == '__main__':
+    main()
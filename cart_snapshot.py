@@ -0,0 +1,84 @@
+"""
+Compact binary snapshots of a shopping cart.
+
+A snapshot holds only catalog positions and quantities, so a cart can be
+moved between workers that loaded the same catalog without pickling Item
+objects along with it.
+
+Layout (little endian):
+    header: magic (4s) | version (B) | catalog fingerprint (I) | line count (I)
+    line:   catalog index (I) | quantity (I)
+"""
+
+import struct
+import zlib
+from typing import Dict, List, Tuple
+from errors import SnapshotError
+from item import Item
+
+MAGIC = b'CART'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sBII')
+_LINE = struct.Struct('<II')
+MAX_QUANTITY = 2 ** 32 - 1
+
+
+def catalog_fingerprint(items: List[Item]) -> int:
+    """Checksum of catalog item names, in catalog order."""
+    return zlib.crc32('\0'.join(item.name for item in items).encode('utf-8'))
+
+
+def encode_cart(cart_items: Dict[str, Dict], index_by_name: Dict[str, int],
+                fingerprint: int) -> bytes:
+    """
+    Pack cart lines into a snapshot.
+    Args:
+        cart_items: Cart contents in ShoppingCart.items format
+        index_by_name: Catalog position of every item name
+        fingerprint: Fingerprint of the catalog the indexes refer to
+    Raises:
+        SnapshotError: If a quantity does not fit in a snapshot line
+    """
+    buffer = bytearray(_HEADER.size + _LINE.size * len(cart_items))
+    _HEADER.pack_into(buffer, 0, MAGIC, VERSION, fingerprint, len(cart_items))
+
+    offset = _HEADER.size
+    for item_name, item_data in cart_items.items():
+        quantity = item_data['quantity']
+        if quantity > MAX_QUANTITY:
+            raise SnapshotError(f"Quantity of '{item_name}' is too large for a snapshot: {quantity}")
+        _LINE.pack_into(buffer, offset, index_by_name[item_name], quantity)
+        offset += _LINE.size
+    return bytes(buffer)
+
+
+def decode_cart(data: bytes, items: List[Item],
+                fingerprint: int) -> List[Tuple[Item, int]]:
+    """
+    Unpack a snapshot into (item, quantity) pairs from the given catalog.
+    Raises:
+        SnapshotError: If the data is malformed or was made from another catalog
+    """
+    if len(data) < _HEADER.size:
+        raise SnapshotError("Snapshot is truncated")
+
+    magic, version, snapshot_fingerprint, count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise SnapshotError("Not a cart snapshot")
+    if version != VERSION:
+        raise SnapshotError(f"Unsupported snapshot version: {version}")
+    if snapshot_fingerprint != fingerprint:
+        raise SnapshotError("Snapshot was made from a different catalog")
+    if len(data) != _HEADER.size + _LINE.size * count:
+        raise SnapshotError(f"Snapshot size does not match its {count} lines")
+
+    lines = []
+    catalog_size = len(items)
+    for index, quantity in _LINE.iter_unpack(memoryview(data)[_HEADER.size:]):
+        if index >= catalog_size:
+            raise SnapshotError(f"Unknown catalog index: {index}")
+        if quantity == 0:
+            raise SnapshotError(f"Invalid quantity for '{items[index].name}': 0")
+        lines.append((items[index], quantity))
+    return lines
@@ -15,4 +15,8 @@ class InsufficientStockError(Exception):
 
 class InvalidQuantityError(Exception):
     """Raised when quantity is invalid."""
-    pass
\ No newline at end of file
+    pass
+
+class SnapshotError(Exception):
+    """Raised when a cart snapshot is invalid."""
+    pass
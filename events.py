@@ -0,0 +1,139 @@
+"""
+Change feed for inventory and cart mutations.
+"""
+
+import asyncio
+from collections import deque
+from itertools import count
+from typing import Callable, List, NamedTuple, Optional
+
+
+class ChangeEvent(NamedTuple):
+    """A single inventory or cart mutation."""
+    sequence: int
+    kind: str
+    subject: Optional[str]
+    quantity: int
+    location: Optional[str] = None
+
+
+Subscriber = Callable[[List[ChangeEvent]], None]
+
+
+class ChangeFeed:
+    """
+    Publish/subscribe feed that delivers events to subscribers in batches.
+
+    Events wait in a bounded ring buffer and are only delivered, as one batch,
+    when flush() is called; publish() never calls subscribers. If more than
+    capacity events are pending, the oldest are dropped and counted in dropped.
+    While nobody is subscribed, publish() returns at once, and publishers can
+    skip the call entirely by checking active.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        """
+        Initialize an empty feed.
+        Args:
+            capacity: Maximum number of pending events (oldest are dropped)
+        """
+        if capacity <= 0:
+            raise ValueError(f"Capacity must be positive, got: {capacity}")
+        self._buffer = deque(maxlen=capacity)
+        self._subscribers = []
+        self._sequence = count()
+        self.active = False
+        self.dropped = 0
+        self.errors = 0
+
+    def publish(self, kind: str, subject: Optional[str], quantity: int = 0,
+                location: Optional[str] = None) -> None:
+        """Record a mutation for subscribers."""
+        if not self.active:
+            return
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        # stored as plain tuples, turned into events once per batch
+        self._buffer.append((next(self._sequence), kind, subject, quantity, location))
+
+    def flush(self) -> None:
+        """
+        Deliver pending events to every subscriber.
+        A failing subscriber is counted in errors and does not stop the others.
+        """
+        if not self._buffer:
+            return
+        batch = list(map(ChangeEvent._make, self._buffer))
+        self._buffer.clear()
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber(batch)
+            except Exception:
+                self.errors += 1
+
+    def subscribe(self, subscriber: Subscriber) -> Subscriber:
+        """Register a callback that receives lists of events."""
+        self._subscribers.append(subscriber)
+        self.active = True
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Remove a registered callback."""
+        self._subscribers.remove(subscriber)
+        if not self._subscribers:
+            self.active = False
+            # nobody is left to receive pending events
+            self._buffer.clear()
+
+    def stream(self, capacity: int = 1024) -> 'ChangeStream':
+        """Subscribe an asyncio iterator to the feed."""
+        return ChangeStream(self, capacity)
+
+
+class ChangeStream:
+    """
+    Async iterator over feed events, for use with 'async for'.
+
+    Events queue up in a bounded buffer; if the consumer falls behind, the
+    oldest are dropped and counted. The feed must be published to from the
+    event loop's thread.
+    """
+
+    def __init__(self, feed: ChangeFeed, capacity: int):
+        """Subscribe to feed."""
+        self._feed = feed
+        self._queue = deque(maxlen=capacity)
+        self._ready = None
+        self._closed = False
+        self.dropped = 0
+        feed.subscribe(self._deliver)
+
+    def _deliver(self, batch: List[ChangeEvent]) -> None:
+        overflow = len(self._queue) + len(batch) - self._queue.maxlen
+        if overflow > 0:
+            self.dropped += overflow
+        self._queue.extend(batch)
+        if self._ready is not None:
+            self._ready.set()
+
+    def close(self) -> None:
+        """Unsubscribe and end iteration once queued events are consumed."""
+        if self._closed:
+            return
+        self._closed = True
+        self._feed.unsubscribe(self._deliver)
+        if self._ready is not None:
+            self._ready.set()
+
+    def __aiter__(self) -> 'ChangeStream':
+        return self
+
+    async def __anext__(self) -> ChangeEvent:
+        while not self._queue:
+            if self._closed:
+                raise StopAsyncIteration
+            if self._ready is None:
+                self._ready = asyncio.Event()
+            await self._ready.wait()
+            self._ready.clear()
+        return self._queue.popleft()
@@ -1,10 +1,15 @@
-from typing import List
+from typing import Callable, Dict, List, Optional
+from events import ChangeFeed
+
+# Location used for items listed with a single stock figure
+DEFAULT_LOCATION = 'default'
 
 class Item:
     """Represents an item in the store."""
     
     def __init__(self, item_name: str, item_price: float, 
-                 item_description: str, stock: int):
+                 item_description: str, stock: int,
+                 locations: Dict[str, int] = None, feed: ChangeFeed = None):
         """
         Initialize an item.
         Args:
@@ -12,11 +17,19 @@ class Item:
             item_price: Price of the item  
             item_description: Description of the item
             stock: Available stock
+            locations: Stock per warehouse location (overrides stock)
+            feed: Change feed that stock changes are published to
         """
         self.name = item_name
         self.price = item_price
         self.description = item_description
-        self.stock = stock
+        if locations is None:
+            locations = {DEFAULT_LOCATION: stock}
+        self.locations = dict(locations)
+        self.stock = sum(self.locations.values())
+        self._feed = feed
+        # called as listener(item, location) after stock at a location changes
+        self.location_listener: Optional[Callable[['Item', str], None]] = None
 
     def __str__(self) -> str:
         """String representation of the item."""
@@ -29,12 +42,46 @@ class Item:
         """Check if item has enough stock."""
         return self.stock >= quantity
     
-    def reduce_stock(self, quantity: int) -> None:
-        """Reduce stock by quantity."""
+    def _single_location(self) -> str:
+        """Get the only location of the item, for calls that don't name one."""
+        if len(self.locations) != 1:
+            raise ValueError(
+                f"'{self.name}' is stocked in {len(self.locations)} locations, "
+                f"a location must be given"
+            )
+        return next(iter(self.locations))
+    
+    def reduce_stock(self, quantity: int, location: str = None) -> None:
+        """Reduce stock by quantity (location is required for multi-location items)."""
         if not self.has_stock(quantity):
             raise ValueError(f"Not enough stock. Available: {self.stock}, requested: {quantity}")
+        if location is None:
+            location = self._single_location()
+        self.reduce_location_stock(location, quantity)
+    
+    def add_stock(self, quantity: int, location: str = None) -> None:
+        """Add stock (location is required for multi-location items)."""
+        if location is None:
+            location = self._single_location()
+        self.add_location_stock(location, quantity)
+    
+    def reduce_location_stock(self, location: str, quantity: int) -> None:
+        """Reduce stock at a location by quantity."""
+        available = self.locations.get(location, 0)
+        if available < quantity:
+            raise ValueError(f"Not enough stock at '{location}'. Available: {available}, requested: {quantity}")
+        self.locations[location] = available - quantity
         self.stock -= quantity
+        if self.location_listener is not None:
+            self.location_listener(self, location)
+        if self._feed is not None and self._feed.active:
+            self._feed.publish('stock_reduced', self.name, quantity, location)
     
-    def add_stock(self, quantity: int) -> None:
-        """Add stock."""
-        self.stock += quantity
\ No newline at end of file
+    def add_location_stock(self, location: str, quantity: int) -> None:
+        """Add stock at a location."""
+        self.locations[location] = self.locations.get(location, 0) + quantity
+        self.stock += quantity
+        if self.location_listener is not None:
+            self.location_listener(self, location)
+        if self._feed is not None and self._feed.active:
+            self._feed.publish('stock_added', self.name, quantity, location)
\ No newline at end of file
@@ -1,14 +1,20 @@
 from typing import Dict, Any
 from errors import ItemNotExistError, InvalidQuantityError
 from item import Item
+from events import ChangeFeed
 
 class ShoppingCart:
     """Shopping cart that stores items with quantities."""
     
-    def __init__(self):
-        """Initialize empty cart."""
+    def __init__(self, feed: ChangeFeed = None):
+        """
+        Initialize empty cart.
+        Args:
+            feed: Change feed that cart changes are published to
+        """
         # format: {item_name: {'item': Item, 'quantity': int}}
         self._items = {}
+        self._feed = feed
     
     @property
     def items(self) -> Dict[str, Dict[str, Any]]:
@@ -34,6 +40,8 @@ class ShoppingCart:
                 'item': item,
                 'quantity': quantity
             }
+        if self._feed is not None and self._feed.active:
+            self._feed.publish('cart_item_added', item.name, quantity)
 
     def remove_item(self, item_name: str, quantity: int = None) -> None:
         """
@@ -47,6 +55,7 @@ class ShoppingCart:
         
         if quantity is None:
             # Remove entire item
+            quantity = self._items[item_name]['quantity']
             del self._items[item_name]
         else:
             if quantity <= 0:
@@ -55,10 +64,14 @@ class ShoppingCart:
             current_qty = self._items[item_name]['quantity']
             if quantity >= current_qty:
                 # Remove entire item
+                quantity = current_qty
                 del self._items[item_name]
             else:
                 # Reduce quantity
                 self._items[item_name]['quantity'] -= quantity
+        
+        if self._feed is not None and self._feed.active:
+            self._feed.publish('cart_item_removed', item_name, quantity)
 
     def get_subtotal(self) -> float:
         """Calculate total price of items in cart."""
@@ -80,6 +93,8 @@ class ShoppingCart:
     def clear(self) -> None:
         """Clear all items from cart."""
         self._items.clear()
+        if self._feed is not None and self._feed.active:
+            self._feed.publish('cart_cleared', None)
     
     def has_item(self, item_name: str) -> bool:
         """Check if item is in cart."""
@@ -1,34 +1,108 @@
 import yaml
-from typing import List, Dict, Any
-from item import Item
+from typing import List, Dict, Any, Union
+from item import Item, DEFAULT_LOCATION
 from shopping_cart import ShoppingCart
+from allocation import StockAllocator, Strategy
+from events import ChangeFeed
+from cart_snapshot import catalog_fingerprint, encode_cart, decode_cart
 from errors import *
 
 
 class Store:
     """Main store class with inventory and cart management."""
     
-    def __init__(self, path: str):
-        """Initialize store with items from file."""
+    def __init__(self, path: str, allocation_strategy: Union[str, Strategy] = 'nearest'):
+        """
+        Initialize store with items from file.
+        Args:
+            path: Inventory file
+            allocation_strategy: How order lines are split across warehouses
+        """
         with open(path, 'r') as inventory:
-            items_raw = yaml.safe_load(inventory)['items']
-        self._items = self._convert_to_item_objects(items_raw)
-        self._shopping_cart = ShoppingCart()
+            inventory_raw = yaml.safe_load(inventory)
+        distances = {warehouse['name']: float(warehouse.get('distance', 0))
+                     for warehouse in inventory_raw.get('warehouses', [])}
+        # where items listed with a plain 'stock' keep it
+        stock_location = inventory_raw.get('default_warehouse')
+        if stock_location is None:
+            stock_location = None if distances else DEFAULT_LOCATION
+        elif stock_location not in distances:
+            raise ValueError(f"Default warehouse '{stock_location}' is not listed under 'warehouses'")
+        self._changes = ChangeFeed()
+        self._items = self._convert_to_item_objects(inventory_raw['items'], self._changes, stock_location)
+        if distances:
+            self._check_locations(self._items, distances)
+        self._allocator = StockAllocator(self._items, distances, allocation_strategy)
+        # format: {item_name: {location: quantity}} for items in the cart
+        self._allocations = {}
+        self._index_by_name = {item.name: i for i, item in enumerate(self._items)}
+        self._fingerprint = catalog_fingerprint(self._items)
+        self._shopping_cart = ShoppingCart(self._changes)
 
     @staticmethod
-    def _convert_to_item_objects(items_raw: List[Dict]) -> List[Item]:
-        """Convert raw item data to Item objects."""
+    def _convert_to_item_objects(items_raw: List[Dict], feed: ChangeFeed = None,
+                                 stock_location: str = DEFAULT_LOCATION) -> List[Item]:
+        """
+        Convert raw item data to Item objects.
+        Args:
+            items_raw: Raw item data
+            feed: Change feed passed to every item
+            stock_location: Location for items given a plain 'stock' (None = not allowed)
+        """
         items = []
         for item_data in items_raw:
+            Store._check_stock(item_data)
+            if 'stock' in item_data:
+                if stock_location is None:
+                    raise ValueError(
+                        f"Item '{item_data['name']}' uses 'stock'. Use 'locations' when "
+                        f"'warehouses' is declared, or set 'default_warehouse'"
+                    )
+                locations = {stock_location: Store._read_count(item_data['name'], item_data['stock'])}
+            else:
+                if not isinstance(item_data['locations'], dict):
+                    raise ValueError(f"Item '{item_data['name']}' needs 'locations' to map warehouses to counts")
+                locations = {location: Store._read_count(item_data['name'], count, f" at '{location}'")
+                             for location, count in item_data['locations'].items()}
             item = Item(
                 item_data['name'],
                 float(item_data['price']),
                 item_data['description'],
-                item_data['stock']
+                0,
+                locations,
+                feed
             )
             items.append(item)
         return items
     
+    @staticmethod
+    def _check_stock(item_data: Dict) -> None:
+        """Make sure raw item data has either stock or locations."""
+        if ('stock' in item_data) == ('locations' in item_data):
+            raise ValueError(f"Item '{item_data['name']}' needs exactly one of 'stock' or 'locations'")
+    
+    @staticmethod
+    def _read_count(item_name: str, count: Any, where: str = '') -> int:
+        """Convert a raw stock count to a non-negative int."""
+        try:
+            value = int(count)
+        except (TypeError, ValueError):
+            raise ValueError(f"Item '{item_name}' has non-numeric stock{where}: {count!r}")
+        if value < 0:
+            raise ValueError(f"Item '{item_name}' has negative stock{where}: {value}")
+        return value
+    
+    @staticmethod
+    def _check_locations(items: List[Item], distances: Dict[str, float]) -> None:
+        """Make sure items only keep stock in declared warehouses."""
+        for item in items:
+            for location in item.locations:
+                if location not in distances:
+                    raise ValueError(
+                        f"Item '{item.name}' has stock in unknown warehouse '{location}'. "
+                        f"Declared warehouses: {', '.join(distances)}"
+                    )
+    
     def __str__(self) -> str:
         """String representation of the store showing all items with name and price."""
         if not self._items:
@@ -49,6 +123,11 @@ class Store:
     
         return f"Store Items ({len(self._items)} total):\n" + "\n".join(lines)
 
+    @property
+    def changes(self) -> ChangeFeed:
+        """Feed of stock and cart changes, delivered after each store operation."""
+        return self._changes
+
     def get_items(self) -> List[Item]:
         """Get all store items."""
         return self._items
@@ -101,8 +180,7 @@ class Store:
                 )
             
             # Add to cart and reduce stock
-            self._shopping_cart.add_item(item, quantity)
-            item.reduce_stock(quantity)
+            self._reserve(item, quantity)
             
             return {
                 'success': True,
@@ -114,6 +192,8 @@ class Store:
                 'success': False,
                 'message': str(e)
             }
+        finally:
+            self._changes.flush()
 
     def remove_item(self, item_name: str, quantity: int = None) -> Dict[str, Any]:
         """
@@ -151,7 +231,7 @@ class Store:
             
             # Remove from cart and restore stock
             self._shopping_cart.remove_item(item.name, quantity)
-            item.add_stock(remove_qty)
+            self._release(item, remove_qty)
             
             return {
                 'success': True,
@@ -163,6 +243,34 @@ class Store:
                 'success': False,
                 'message': str(e)
             }
+        finally:
+            self._changes.flush()
+
+    def clear_cart(self) -> Dict[str, Any]:
+        """
+        Remove everything from cart and restore stock.
+        
+        Returns:
+            Dict with success status and message
+        """
+        try:
+            item_count = self._shopping_cart.get_total_items()
+            for item_data in list(self._shopping_cart.items.values()):
+                self._release(item_data['item'], item_data['quantity'])
+            self._shopping_cart.clear()
+            
+            return {
+                'success': True,
+                'message': f"Removed {item_count} items from cart"
+            }
+            
+        except Exception as e:
+            return {
+                'success': False,
+                'message': str(e)
+            }
+        finally:
+            self._changes.flush()
 
     def checkout(self) -> Dict[str, Any]:
         """
@@ -180,16 +288,90 @@ class Store:
         total = self._shopping_cart.get_subtotal()
         item_count = self._shopping_cart.get_total_items()
         
+        allocations = self._allocations
+        
         # Clear cart (stock already reduced when items were added)
         self._shopping_cart.clear()
+        self._allocations = {}
+        self._changes.publish('checkout', None, item_count)
+        self._changes.flush()
         
         return {
             'success': True,
             'message': f"Checkout successful! Total: ${total:.2f} ({item_count} items)",
             'total': total,
-            'item_count': item_count
+            'item_count': item_count,
+            'allocations': allocations
         }
 
+    def _reserve(self, item: Item, quantity: int) -> None:
+        """Allocate stock for item across warehouses and add it to the cart."""
+        allocation = self._allocator.allocate(item, quantity)
+        self._shopping_cart.add_item(item, quantity)
+        line_allocation = self._allocations.setdefault(item.name, {})
+        for location, units in allocation.items():
+            line_allocation[location] = line_allocation.get(location, 0) + units
+
+    def _release(self, item: Item, quantity: int) -> None:
+        """Return stock allocated to a cart item to its warehouses."""
+        line_allocation = self._allocations[item.name]
+        self._allocator.release(item, line_allocation, quantity)
+        if not line_allocation:
+            del self._allocations[item.name]
+
+    def export_cart(self) -> bytes:
+        """
+        Serialize the cart so another worker with the same catalog can import it.
+        Stock held by the cart is not released here.
+
+        Returns:
+            Compact cart snapshot
+        Raises:
+            SnapshotError: If the cart cannot be represented in a snapshot
+        """
+        return encode_cart(self._shopping_cart.items, self._index_by_name, self._fingerprint)
+
+    def import_cart(self, snapshot: bytes) -> Dict[str, Any]:
+        """
+        Reattach an exported cart to this store's catalog, reserving its stock.
+        The current cart must be empty. Nothing is changed if any line fails.
+
+        Returns:
+            Dict with success status and message
+        """
+        try:
+            if not self._shopping_cart.is_empty():
+                raise SnapshotError("Cart must be empty to import a snapshot")
+
+            lines = decode_cart(snapshot, self._items, self._fingerprint)
+
+            # Check all stock first so a failed import leaves nothing behind
+            requested = {}
+            for item, quantity in lines:
+                requested[item.name] = requested.get(item.name, 0) + quantity
+            for item, quantity in lines:
+                if not item.has_stock(requested[item.name]):
+                    raise InsufficientStockError(
+                        f"Not enough stock for '{item.name}'. "
+                        f"Available: {item.stock}, requested: {requested[item.name]}"
+                    )
+
+            for item, quantity in lines:
+                self._reserve(item, quantity)
+
+            return {
+                'success': True,
+                'message': f"Imported cart with {len(lines)} lines"
+            }
+
+        except Exception as e:
+            return {
+                'success': False,
+                'message': str(e)
+            }
+        finally:
+            self._changes.flush()
+
     def show_cart(self) -> None:
         """Display cart contents."""
         if self._shopping_cart.is_empty():